@@ -15,6 +15,15 @@ import test_parser_helpers
 import test_pattern_detection
 import test_dynamic_sql
 import test_integration
+import test_copybooks
+import test_cl_parser
+import test_source_export
+import test_prototypes
+import test_hub_decomposition
+import test_parallel_loader
+import test_repositories
+import test_island_report
+import test_watch_mode
 
 
 def run_all_tests():
@@ -29,6 +38,15 @@ def run_all_tests():
         test_pattern_detection.run_all_tests()
         test_dynamic_sql.run_all_tests()
         test_integration.run_all_tests()
+        test_copybooks.run_all_tests()
+        test_cl_parser.run_all_tests()
+        test_source_export.run_all_tests()
+        test_prototypes.run_all_tests()
+        test_hub_decomposition.run_all_tests()
+        test_parallel_loader.run_all_tests()
+        test_repositories.run_all_tests()
+        test_island_report.run_all_tests()
+        test_watch_mode.run_all_tests()
 
         print("\n" + "="*60)
         print("  ✅ ALL TEST SUITES PASSED!")
@@ -0,0 +1,123 @@
+"""
+Tests for the CL parser
+
+Tests the CL command scanner and the per-extension dispatch:
+- split_cl_commands()
+- parse_cl_command()
+- detect_cl_dependencies()
+- parse_cl_file() / parse_source_file()
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import nbimporter
+import rpg_dependency_analyzer as rda
+
+
+def test_split_cl_commands_continuation():
+    """Test '+' and '-' continuation lines and comment removal"""
+    source = """PGM
+/* Submit the nightly run +
+   to batch */
+             CALL       PGM(MYLIB/ORD+
+                        ENTRY) +
+                          PARM(&ORD)
+             SNDPGMMSG  MSG('Done -
+   ok')
+ENDPGM
+"""
+    commands = list(rda.split_cl_commands(source))
+
+    assert commands[0] == (1, 'PGM')
+    assert commands[1] == (4, 'CALL       PGM(MYLIB/ORDENTRY) PARM(&ORD)')
+    assert commands[2][1] == "SNDPGMMSG  MSG('Done    ok')"
+    assert commands[3] == (9, 'ENDPGM')
+    print("✓ test_split_cl_commands_continuation passed")
+
+
+def test_parse_cl_command_keywords_and_positional():
+    """Test keyword and positional parameters"""
+    name, params = rda.parse_cl_command("CALL PGM(MYLIB/ORDPGM) PARM(&ORD 'A B')")
+    assert name == 'CALL'
+    assert params == {'PGM': 'MYLIB/ORDPGM', 'PARM': "&ORD 'A B'"}
+
+    name, params = rda.parse_cl_command("LOOP: CALL ORDPGM")
+    assert name == 'CALL'
+    assert params == {'PGM': 'ORDPGM'}
+    print("✓ test_parse_cl_command_keywords_and_positional passed")
+
+
+def test_detect_cl_dependencies():
+    """Test dependency mapping for common CL commands"""
+    def deps(command):
+        return [(d['target'], d['type'], d['action'])
+                for d in rda.detect_cl_dependencies(*rda.parse_cl_command(command))]
+
+    assert deps("CALL PGM(*LIBL/ORDPGM)") == [('ORDPGM', 'CALLS', 'EXECUTE')]
+    assert deps("CALL PGM(&PGM)") == []
+    assert deps("SBMJOB CMD(CALL PGM(NIGHTLY)) JOB(NIGHT)") == [('NIGHTLY', 'CALLS', 'SUBMIT')]
+    assert deps("OVRDBF FILE(CUST) TOFILE(ARCHIVE/CUSTHIST)") == [('CUSTHIST', 'ACCESSES', 'OVERRIDE')]
+    assert deps("CPYF FROMFILE(ORDERS) TOFILE(QTEMP/ORDCPY)") == [
+        ('ORDERS', 'ACCESSES', 'READ'), ('ORDCPY', 'ACCESSES', 'WRITE')]
+    # A SQL script member is not a program - no fake Program node
+    assert deps("RUNSQLSTM SRCFILE(QSQLSRC) SRCMBR(PURGE)") == []
+    assert deps("SBMJOB CMD(RUNSQLSTM SRCFILE(QSQLSRC) SRCMBR(CRTTBL)) JOB(INIT)") == []
+    assert deps("RUNSQL SQL('DELETE FROM AUDITLOG') COMMIT(*NONE)") == [('AUDITLOG', 'ACCESSES', 'SQL')]
+    assert deps("MONMSG MSGID(CPF0000) EXEC(CALL ERRHDL)") == [('ERRHDL', 'CALLS', 'EXECUTE')]
+    print("✓ test_detect_cl_dependencies passed")
+
+
+def test_parse_cl_file_dispatch():
+    """Test that .clle files are routed to the CL parser"""
+    test_file = '/tmp/NIGHTLY.clle'
+
+    with open(test_file, 'w') as f:
+        f.write("""PGM
+             DCLF       FILE(CTLFILE)
+             /* READ ORDERS */
+             OVRDBF     FILE(ORD) TOFILE(ORDHIST) +
+                          OVRSCOPE(*JOB)
+             CALL       PGM(ORDPURGE)
+ENDPGM
+""")
+
+    dependencies = rda.parse_source_file(test_file)
+    targets = [(d['target'], d['line']) for d in dependencies]
+
+    assert targets == [('CTLFILE', 2), ('ORDHIST', 4), ('ORDPURGE', 6)]
+    assert all(d['source'] == 'NIGHTLY' and d['source_ext'] == 'CLLE' for d in dependencies)
+    # No RPG opcode false positives (e.g. READ in the comment)
+    assert not any(d['target'] == 'ORDERS' for d in dependencies)
+
+    os.remove(test_file)
+
+    print("✓ test_parse_cl_file_dispatch passed")
+
+
+def test_parse_source_file_unknown_extension():
+    """Test that files without a registered parser are skipped"""
+    assert rda.parse_source_file('/tmp/does_not_matter.txt') == []
+
+    registry = rda.default_parser_registry()
+    registry['.txt'] = lambda filepath, copybook_resolver=None, stream=None: [{'target': 'X'}]
+    assert rda.parse_source_file('/tmp/does_not_matter.txt', registry) == [{'target': 'X'}]
+    print("✓ test_parse_source_file_unknown_extension passed")
+
+
+def run_all_tests():
+    """Run all CL parser tests"""
+    print("\n=== Running CL Parser Tests ===\n")
+
+    test_split_cl_commands_continuation()
+    test_parse_cl_command_keywords_and_positional()
+    test_detect_cl_dependencies()
+    test_parse_cl_file_dispatch()
+    test_parse_source_file_unknown_extension()
+
+    print("\n✅ All CL parser tests passed!\n")
+
+
+if __name__ == '__main__':
+    run_all_tests()
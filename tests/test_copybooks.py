@@ -0,0 +1,183 @@
+"""
+Tests for copybook resolution
+
+Tests the /COPY and /INCLUDE handling:
+- parse_copy_directive()
+- CopybookResolver (location, parse-once caching, cycles, include graph)
+- parse_rpg_file() attributing copybook dependencies to including programs
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import nbimporter
+import rpg_dependency_analyzer as rda
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+    return path
+
+
+def test_parse_copy_directive_member_forms():
+    """Test the MEMBER, SRCFILE,MEMBER and LIB/SRCFILE,MEMBER forms"""
+    assert rda.parse_copy_directive("/COPY CUSTPR")['member'] == 'CUSTPR'
+
+    directive = rda.parse_copy_directive("/copy qprotosrc,custpr")
+    assert directive['srcfile'] == 'QPROTOSRC'
+    assert directive['member'] == 'CUSTPR'
+    assert directive['library'] is None
+
+    directive = rda.parse_copy_directive("/INCLUDE MYLIB/QPROTOSRC,CUSTPR")
+    assert directive['library'] == 'MYLIB'
+    assert directive['srcfile'] == 'QPROTOSRC'
+    assert directive['member'] == 'CUSTPR'
+    print("✓ test_parse_copy_directive_member_forms passed")
+
+
+def test_parse_copy_directive_ifs_path():
+    """Test quoted and unquoted IFS paths"""
+    directive = rda.parse_copy_directive("/INCLUDE 'qrpgleref/custpr.rpgleinc'")
+    assert directive['ifs_path'] == 'qrpgleref/custpr.rpgleinc'
+    assert directive['member'] == 'CUSTPR'
+
+    directive = rda.parse_copy_directive("/copy ../qrpgleref/custpr.rpgleinc")
+    assert directive['ifs_path'] == '../qrpgleref/custpr.rpgleinc'
+
+    assert rda.parse_copy_directive("/FREE") is None
+    assert rda.parse_copy_directive("chain KEY CUSTMAST;") is None
+    print("✓ test_parse_copy_directive_ifs_path passed")
+
+
+def test_copybook_dependencies_attributed_to_program():
+    """Test that copybook dependencies are attributed to the including program"""
+    repo = tempfile.mkdtemp()
+    try:
+        _write(os.path.join(repo, 'QCPYSRC', 'CUSTF.rpgleinc'), """**free
+Dcl-F CUSTMAST DISK USAGE(*INPUT);
+""")
+        program = _write(os.path.join(repo, 'QRPGLESRC', 'ORDENTRY.rpgle'), """**free
+/COPY QCPYSRC,CUSTF
+read ORDERS;
+""")
+        resolver = rda.CopybookResolver([repo])
+        dependencies = rda.parse_rpg_file(program, copybook_resolver=resolver)
+
+        custmast = [d for d in dependencies if d['target'] == 'CUSTMAST']
+        assert len(custmast) == 1
+        assert custmast[0]['source'] == 'ORDENTRY'
+        assert custmast[0]['line'] == 2
+        assert custmast[0]['origin'].endswith('CUSTF.rpgleinc')
+        assert custmast[0]['origin_line'] == 2
+
+        orders = [d for d in dependencies if d['target'] == 'ORDERS']
+        assert orders[0]['origin'] == orders[0]['source_path']
+
+        assert len(resolver.include_edges) == 1
+        assert resolver.include_edges[0]['target'] == 'CUSTF'
+        assert resolver.include_edges[0]['source_is_copybook'] is False
+    finally:
+        shutil.rmtree(repo)
+    print("✓ test_copybook_dependencies_attributed_to_program passed")
+
+
+def test_copybook_parsed_once():
+    """Test that a copybook shared by many programs is parsed only once"""
+    repo = tempfile.mkdtemp()
+    try:
+        _write(os.path.join(repo, 'QCPYSRC', 'COMMON.rpgleinc'), """**free
+Dcl-F AUDITLOG DISK USAGE(*OUTPUT);
+""")
+        resolver = rda.CopybookResolver(repo)
+        for n in range(5):
+            program = _write(os.path.join(repo, 'QRPGLESRC', f'PGM{n}.rpgle'),
+                             "**free\n/copy COMMON\n")
+            dependencies = rda.parse_rpg_file(program, copybook_resolver=resolver)
+            assert [d['source'] for d in dependencies if d['target'] == 'AUDITLOG'] == [f'PGM{n}']
+
+        assert resolver.parse_count == 1
+        assert len(resolver.include_edges) == 5
+    finally:
+        shutil.rmtree(repo)
+    print("✓ test_copybook_parsed_once passed")
+
+
+def test_nested_copybooks_and_cycles():
+    """Test nested includes are expanded and include cycles are cut"""
+    repo = tempfile.mkdtemp()
+    try:
+        _write(os.path.join(repo, 'QCPYSRC', 'OUTER.rpgleinc'), """**free
+/copy INNER
+Dcl-F OUTERF DISK;
+""")
+        _write(os.path.join(repo, 'QCPYSRC', 'INNER.rpgleinc'), """**free
+/copy OUTER
+Dcl-F INNERF DISK;
+""")
+        program = _write(os.path.join(repo, 'QRPGLESRC', 'MAIN.rpgle'), "**free\n/copy OUTER\n")
+
+        resolver = rda.CopybookResolver(repo)
+        dependencies = rda.parse_rpg_file(program, copybook_resolver=resolver)
+
+        targets = sorted(d['target'] for d in dependencies)
+        assert targets == ['INNERF', 'OUTERF']
+        assert all(d['source'] == 'MAIN' for d in dependencies)
+
+        inner = [d for d in dependencies if d['target'] == 'INNERF'][0]
+        assert inner['origin'].endswith('INNER.rpgleinc')
+
+        assert len(resolver.cycles) == 1
+        nested = [e for e in resolver.include_edges if e['source_is_copybook']]
+        assert len(nested) == 2
+
+        # INNER's expansion cut the cycle, so including it directly still sees OUTER
+        second = _write(os.path.join(repo, 'QRPGLESRC', 'SECOND.rpgle'), "**free\n/copy INNER\n")
+        dependencies = rda.parse_rpg_file(second, copybook_resolver=resolver)
+        assert sorted(d['target'] for d in dependencies) == ['INNERF', 'OUTERF']
+        assert all(d['source'] == 'SECOND' for d in dependencies)
+
+        # The re-expanded cycle is neither reported nor recorded twice
+        assert len(resolver.cycles) == 1
+        nested = [e for e in resolver.include_edges if e['source_is_copybook']]
+        assert len(nested) == 2
+    finally:
+        shutil.rmtree(repo)
+    print("✓ test_nested_copybooks_and_cycles passed")
+
+
+def test_unresolved_copybook():
+    """Test that missing copybooks are reported, not fatal"""
+    repo = tempfile.mkdtemp()
+    try:
+        program = _write(os.path.join(repo, 'MAIN.rpgle'), "**free\n/copy MISSING\nread CUST;\n")
+        resolver = rda.CopybookResolver(repo)
+        dependencies = rda.parse_rpg_file(program, copybook_resolver=resolver)
+
+        assert [d['target'] for d in dependencies] == ['CUST']
+        assert resolver.unresolved[0]['target'] == 'MISSING'
+    finally:
+        shutil.rmtree(repo)
+    print("✓ test_unresolved_copybook passed")
+
+
+def run_all_tests():
+    """Run all copybook tests"""
+    print("\n=== Running Copybook Tests ===\n")
+
+    test_parse_copy_directive_member_forms()
+    test_parse_copy_directive_ifs_path()
+    test_copybook_dependencies_attributed_to_program()
+    test_copybook_parsed_once()
+    test_nested_copybooks_and_cycles()
+    test_unresolved_copybook()
+
+    print("\n✅ All copybook tests passed!\n")
+
+
+if __name__ == '__main__':
+    run_all_tests()
@@ -0,0 +1,132 @@
+"""
+Tests for hub-aware island decomposition
+
+Tests splitting giant islands into subislands:
+- build_dependency_edges() / compute_node_degrees()
+- select_hubs()
+- connected_components() / louvain_communities()
+- decompose_island() including the hub report
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import nbimporter
+import pandas as pd
+import rpg_dependency_analyzer as rda
+
+
+def _deps(rows):
+    return pd.DataFrame([
+        {'source': source, 'target': target, 'type': kind,
+         'target_kind': 'Program' if kind == 'CALLS' else 'Table'}
+        for source, target, kind in rows
+    ])
+
+
+def _subsystems():
+    """Two order/customer subsystems that only share a logging utility"""
+    rows = []
+    for prefix in ('ORD', 'CUS'):
+        for n in range(4):
+            rows.append((f'{prefix}{n}', f'{prefix}FILE', 'ACCESSES'))
+            rows.append((f'{prefix}{n}', f'{prefix}{(n + 1) % 4}', 'CALLS'))
+            rows.append((f'{prefix}{n}', 'LOGPGM', 'CALLS'))
+    return _deps(rows)
+
+
+def test_build_edges_and_degrees():
+    """Test undirected, de-duplicated edges and neighbour counts"""
+    df = _deps([('A', 'B', 'CALLS'), ('A', 'B', 'CALLS'), ('B', 'A', 'CALLS'), ('A', 'T', 'ACCESSES')])
+    edges = rda.build_dependency_edges(df)
+    assert len(edges) == 2
+
+    degrees = rda.compute_node_degrees(edges)
+    assert degrees == {('Program', 'A'): 2, ('Program', 'B'): 1, ('Table', 'T'): 1}
+    print("✓ test_build_edges_and_degrees passed")
+
+
+def test_select_hubs():
+    """Test explicit thresholds, automatic thresholds and forced hub names"""
+    degrees = {('Program', f'P{n}'): 1 for n in range(30)}
+    degrees[('Program', 'LOGPGM')] = 30
+    degrees[('Program', 'QCMDEXC')] = 2
+
+    hubs, threshold = rda.select_hubs(degrees)
+    assert hubs == {('Program', 'LOGPGM')}
+    assert 2 < threshold < 30
+
+    hubs, _ = rda.select_hubs(degrees, threshold=100, hub_names=['qcmdexc'])
+    assert hubs == {('Program', 'QCMDEXC')}
+    print("✓ test_select_hubs passed")
+
+
+def test_louvain_splits_loosely_connected_groups():
+    """Test that two dense groups joined by one edge become two communities"""
+    adjacency = {}
+
+    def link(u, v):
+        adjacency.setdefault(u, {})[v] = 1.0
+        adjacency.setdefault(v, {})[u] = 1.0
+
+    for group in ('A', 'B'):
+        nodes = [f'{group}{n}' for n in range(5)]
+        for i, u in enumerate(nodes):
+            for v in nodes[i + 1:]:
+                link(u, v)
+    link('A0', 'B0')
+
+    assert len(rda.connected_components(adjacency)) == 1
+
+    communities = rda.louvain_communities(adjacency)
+    assert sorted(sorted(c) for c in communities) == [
+        ['A0', 'A1', 'A2', 'A3', 'A4'], ['B0', 'B1', 'B2', 'B3', 'B4']]
+    print("✓ test_louvain_splits_loosely_connected_groups passed")
+
+
+def test_decompose_island_excluding_hubs():
+    """Test that removing the shared utility splits the island and reports it"""
+    edges = rda.build_dependency_edges(_subsystems())
+    members = {node for edge in edges for node in edge}
+    hubs = {('Program', 'LOGPGM')}
+
+    subislands, hub_report = rda.decompose_island(members, edges, hubs)
+
+    assert [len(s) for s in subislands] == [5, 5]
+    assert all(('Program', 'LOGPGM') not in s for s in subislands)
+    assert {name[:3] for _, name in subislands[0]} in ({'ORD'}, {'CUS'})
+    assert hub_report == [{'hub': ('Program', 'LOGPGM'), 'degree': 8, 'subislands': 2}]
+    print("✓ test_decompose_island_excluding_hubs passed")
+
+
+def test_decompose_island_down_weighting_hubs():
+    """Test that down-weighted hubs are kept and assigned by community detection"""
+    edges = rda.build_dependency_edges(_subsystems())
+    members = {node for edge in edges for node in edge}
+    hubs = {('Program', 'LOGPGM')}
+
+    subislands, _ = rda.decompose_island(members, edges, hubs, hub_weight=0.1, max_subisland_size=5)
+
+    assert sum(len(s) for s in subislands) == len(members)
+    assert len(subislands) == 2
+    for subisland in subislands:
+        assert len({name[:3] for _, name in subisland if name != 'LOGPGM'}) == 1
+    print("✓ test_decompose_island_down_weighting_hubs passed")
+
+
+def run_all_tests():
+    """Run all hub decomposition tests"""
+    print("\n=== Running Hub Decomposition Tests ===\n")
+
+    test_build_edges_and_degrees()
+    test_select_hubs()
+    test_louvain_splits_loosely_connected_groups()
+    test_decompose_island_excluding_hubs()
+    test_decompose_island_down_weighting_hubs()
+
+    print("\n✅ All hub decomposition tests passed!\n")
+
+
+if __name__ == '__main__':
+    run_all_tests()
@@ -0,0 +1,180 @@
+"""
+Tests for the static island report
+
+Tests the offline layout and the incremental report writer:
+- force_directed_layout()
+- pack_islands()
+- render_island_svg()
+- island_key()
+- write_island_report() (files, incremental re-rendering, removal, reloads)
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import nbimporter
+import numpy as np
+import rpg_dependency_analyzer as rda
+
+
+def _island(island_id, size, name=None, summary=None):
+    nodes = [('Program', f'PGM{island_id}_{n}') for n in range(size - 1)] + [('Table', f'TAB{island_id}')]
+    edges = [(n, size - 1) for n in range(size - 1)] + [(n, n + 1) for n in range(size - 2)]
+    return {'key': rda.island_key('SRC', nodes), 'repository': 'SRC', 'island_id': island_id,
+            'name': name, 'summary': summary, 'nodes': nodes, 'edges': edges}
+
+
+def test_force_directed_layout():
+    """Test determinism, shape and that connected nodes end up close together"""
+    edges = [(0, 1), (1, 2), (2, 0), (3, 4), (4, 5), (5, 3), (0, 3)]
+    first = rda.force_directed_layout(6, edges, iterations=200)
+    second = rda.force_directed_layout(6, edges, iterations=200)
+
+    assert first.shape == (6, 2)
+    assert np.allclose(first, second)
+    assert np.allclose(first.mean(axis=0), 0)
+
+    distance = lambda i, j: np.linalg.norm(first[i] - first[j])
+    assert distance(1, 2) < distance(1, 5)
+
+    assert rda.force_directed_layout(0, []).shape == (0, 2)
+    assert rda.force_directed_layout(1, []).shape == (1, 2)
+    print("✓ test_force_directed_layout passed")
+
+
+def test_force_directed_layout_sampled_repulsion():
+    """Test that large islands use sampled repulsion and stay finite"""
+    edges = [(n, n // 2) for n in range(1, 600)]
+    positions = rda.force_directed_layout(600, edges, iterations=30, sample_size=64)
+    assert positions.shape == (600, 2)
+    assert np.isfinite(positions).all()
+    assert len(np.unique(np.round(positions, 3), axis=0)) == 600
+    print("✓ test_force_directed_layout_sampled_repulsion passed")
+
+
+def test_pack_islands_without_overlap():
+    """Test that packed islands do not overlap and fit the canvas"""
+    sizes = [(10, 8), (3, 3), (6, 12), (1, 1), (4, 2)]
+    offsets, (width, height) = rda.pack_islands(sizes, padding=1.0)
+
+    boxes = [(x, y, x + w, y + h) for (x, y), (w, h) in zip(offsets, sizes)]
+    for a in range(len(boxes)):
+        assert boxes[a][2] <= width and boxes[a][3] <= height
+        for b in range(a + 1, len(boxes)):
+            ax0, ay0, ax1, ay1 = boxes[a]
+            bx0, by0, bx1, by1 = boxes[b]
+            assert ax1 <= bx0 or bx1 <= ax0 or ay1 <= by0 or by1 <= ay0
+
+    # Largest island first, in the top left corner
+    assert offsets[2] == (0.0, 0.0)
+    assert rda.pack_islands([]) == ([], (0.0, 0.0))
+    print("✓ test_pack_islands_without_overlap passed")
+
+
+def test_render_island_svg():
+    """Test path-based overview rendering and escaped tooltips on detail pages"""
+    island = {'nodes': [('Program', 'A<B'), ('Table', 'T')], 'edges': [(0, 1)]}
+    positions = np.array([[0.0, 0.0], [1.0, 2.0]])
+
+    overview = rda.render_island_svg(island, positions, offset=(10, 20))
+    assert 'M10.0 20.0L11.0 22.0' in overview
+    assert overview.count('<path') == 3
+    assert '<circle' not in overview
+
+    detail = rda.render_island_svg(island, positions, detailed=True)
+    assert detail.count('<circle') == 2
+    assert 'Program: A&lt;B' in detail
+    print("✓ test_render_island_svg passed")
+
+
+def test_write_island_report_incremental():
+    """Test report files and that only changed islands are rendered again"""
+    output = tempfile.mkdtemp()
+    try:
+        islands = [_island(0, 8, 'Order Entry', 'Orders & invoices'), _island(1, 3), _island(2, 2)]
+        stats = rda.write_island_report(islands, output, iterations=20)
+        assert stats == {'islands': 3, 'rendered': 3, 'reused': 0, 'removed': 0}
+
+        with open(os.path.join(output, 'index.html'), encoding='utf-8') as f:
+            index = f.read()
+        keys = [island['key'] for island in islands]
+        assert f'islands/{keys[0]}.html' in index and 'Orders &amp; invoices' in index
+        assert '<script src' not in index
+
+        with open(os.path.join(output, 'report.json'), encoding='utf-8') as f:
+            report = json.load(f)
+        assert [entry['size'] for entry in report['islands']] == [8, 3, 2]
+        with open(os.path.join(output, 'islands', f'{keys[0]}.json'), encoding='utf-8') as f:
+            assert len(json.load(f)['positions']) == 8
+
+        # Only the island with a new summary is rendered again, island 2 is gone
+        islands = [_island(0, 8, 'Order Entry', 'Orders & invoices'), _island(1, 3, summary='Batch purge')]
+        stats = rda.write_island_report(islands, output, iterations=20)
+        assert stats == {'islands': 2, 'rendered': 1, 'reused': 1, 'removed': 1}
+        assert not os.path.exists(os.path.join(output, 'islands', f'{keys[2]}.html'))
+    finally:
+        shutil.rmtree(output)
+    print("✓ test_write_island_report_incremental passed")
+
+
+def test_island_key_is_stable():
+    """Test that keys depend on the members only, not on their order"""
+    nodes = [('Program', 'ORDENTRY'), ('Table', 'ORDERS')]
+    key = rda.island_key('SRC', nodes)
+    assert key.startswith('SRC-') and len(key) == len('SRC-') + 12
+    assert rda.island_key('SRC', list(reversed(nodes))) == key
+    assert rda.island_key('SRC', nodes + [('Program', 'ORDPURGE')]) != key
+    assert rda.island_key('OTHER', nodes) != key
+    print("✓ test_island_key_is_stable passed")
+
+
+def test_write_island_report_after_reload():
+    """Test that pages are reused when a reload renumbers islands and reorders members"""
+    output = tempfile.mkdtemp()
+    try:
+        islands = [_island(0, 8, 'Order Entry'), _island(1, 3)]
+        rda.write_island_report(islands, output, iterations=20)
+
+        # New WCC ids, members in another order (edges follow the new order)
+        reloaded = []
+        for island, new_id in zip(islands, (5, 2)):
+            order = list(reversed(range(len(island['nodes']))))
+            position = {old: new for new, old in enumerate(order)}
+            reloaded.append(dict(island, island_id=new_id,
+                                 nodes=[island['nodes'][n] for n in order],
+                                 edges=[(position[i], position[j]) for i, j in island['edges']]))
+
+        stats = rda.write_island_report(reloaded[::-1], output, iterations=20)
+        assert stats == {'islands': 2, 'rendered': 0, 'reused': 2, 'removed': 0}
+
+        with open(os.path.join(output, 'report.json'), encoding='utf-8') as f:
+            entries = {entry['key']: entry for entry in json.load(f)['islands']}
+        assert entries[islands[0]['key']]['island_id'] == 5
+        with open(os.path.join(output, 'index.html'), encoding='utf-8') as f:
+            assert f"islands/{islands[0]['key']}.html" in f.read()
+    finally:
+        shutil.rmtree(output)
+    print("✓ test_write_island_report_after_reload passed")
+
+
+def run_all_tests():
+    """Run all island report tests"""
+    print("\n=== Running Island Report Tests ===\n")
+
+    test_force_directed_layout()
+    test_force_directed_layout_sampled_repulsion()
+    test_pack_islands_without_overlap()
+    test_render_island_svg()
+    test_write_island_report_incremental()
+    test_island_key_is_stable()
+    test_write_island_report_after_reload()
+
+    print("\n✅ All island report tests passed!\n")
+
+
+if __name__ == '__main__':
+    run_all_tests()
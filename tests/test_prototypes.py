@@ -0,0 +1,194 @@
+"""
+Tests for prototype and procedure resolution
+
+Tests the resolution of calls through prototypes:
+- parse_external_name() / detect_prototype() / detect_procedure()
+- join_prototype_lines() (keywords on continuation lines)
+- detect_call_opcode()
+- parse_rpg_file() emitting resolved CALLS and EXPORTS
+- build_prototype_index() / resolve_prototype_calls() (CALLP and free-format calls)
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import nbimporter
+import rpg_dependency_analyzer as rda
+
+
+def _parse(name, source):
+    test_file = f'/tmp/{name}'
+    with open(test_file, 'w') as f:
+        f.write(source)
+    try:
+        return rda.parse_rpg_file(test_file)
+    finally:
+        os.remove(test_file)
+
+
+def test_parse_external_name():
+    """Test EXTPGM / EXTPROC keyword variants"""
+    assert rda.parse_external_name('GETCUST', "EXTPGM('CUSTPGM');") == \
+        {'name': 'GETCUST', 'kind': 'EXTPGM', 'external': 'CUSTPGM'}
+    assert rda.parse_external_name('GETCUST', "EXTPGM;")['external'] == 'GETCUST'
+    assert rda.parse_external_name('FMT', "EXTPROC(*CWIDEN : 'fmtDate')")['external'] == 'FMTDATE'
+    assert rda.parse_external_name('DYN', "EXTPGM(pgmName);")['external'] is None
+    assert rda.parse_external_name('CALC', "") == {'name': 'CALC', 'kind': 'EXTPROC', 'external': 'CALC'}
+    print("✓ test_parse_external_name passed")
+
+
+def test_detect_fixed_format_prototype_and_procedure():
+    """Test PR D-specs and P-specs in fixed format"""
+    d_spec = "     D GetCust         PR                  EXTPGM('CUSTPGM')"
+    result = rda.detect_prototype(d_spec, d_spec.strip(), is_free_context=False)
+    assert result == {'name': 'GETCUST', 'kind': 'EXTPGM', 'external': 'CUSTPGM'}
+
+    p_spec = "     P CalcTax         B                   EXPORT"
+    result = rda.detect_procedure(p_spec, p_spec.strip(), is_free_context=False)
+    assert result == {'name': 'CALCTAX', 'exported': True}
+    print("✓ test_detect_fixed_format_prototype_and_procedure passed")
+
+
+def test_detect_call_opcode():
+    """Test CALL / CALLB / CALLP detection including literal targets"""
+    line = "C                   CALL      'ORDPGM'"
+    cleaned, _ = rda.extract_and_strip_string_literals(line)
+    assert rda.detect_call_opcode(cleaned, line) == ('CALL', 'ORDPGM')
+
+    line = "callb 'CalcTax';"
+    cleaned, _ = rda.extract_and_strip_string_literals(line)
+    assert rda.detect_call_opcode(cleaned, line) == ('CALLB', 'CALCTAX')
+
+    assert rda.detect_call_opcode("callp(e) GetCust(id);", "callp(e) GetCust(id);") == ('CALLP', 'GETCUST')
+    assert rda.detect_call_opcode("dsply '' '' reply;", "dsply 'call X' ' ' reply;") is None
+    print("✓ test_detect_call_opcode passed")
+
+
+def test_parse_resolves_calls_through_prototypes():
+    """Test CALLP and free-format calls resolved to EXTPGM / EXTPROC targets"""
+    dependencies = _parse('ORDENTRY.rpgle', """**free
+dcl-pr GetCust extpgm('CUSTPGM');
+  id char(10);
+end-pr;
+dcl-pr CalcTax extproc('TAX_CALC');
+end-pr;
+
+callp GetCust(custId);
+total = CalcTax(amount) + 1;
+Validate(custId);
+callp Unknown();
+
+dcl-proc Validate;
+end-proc;
+
+dcl-proc FormatOrder export;
+end-proc;
+""")
+    calls = [(d['target'], d['target_kind'], d['line']) for d in dependencies if d['type'] == 'CALLS']
+    assert ('CUSTPGM', 'Program', 8) in calls
+    assert ('TAX_CALC', 'Procedure', 9) in calls
+    # Local procedure calls are internal
+    assert not any(target == 'VALIDATE' for target, _, _ in calls)
+    # Prototype name is never used as a fake program
+    assert not any(target in ('GETCUST', 'CALCTAX') for target, _, _ in calls)
+
+    unresolved = [d for d in dependencies if d.get('resolved') is False]
+    assert [d['prototype'] for d in unresolved if d['is_callp']] == ['UNKNOWN']
+
+    exports = [d['target'] for d in dependencies if d['type'] == 'EXPORTS']
+    assert exports == ['FORMATORDER']
+    print("✓ test_parse_resolves_calls_through_prototypes passed")
+
+
+def test_prototype_keywords_on_continuation_lines():
+    """Test multi-line DCL-PR statements and continued PR D-spec keywords"""
+    dependencies = _parse('ORDFREE.rpgle', """**free
+dcl-pr GetCust
+  extpgm('CUSTPGM');   // keyword on its own line
+  id char(10);
+end-pr;
+Dcl-PR CalcTax
+  Int(10)
+  ExtProc('TAX_CALC');
+End-PR;
+
+callp GetCust(custId);
+total = CalcTax(amount);
+""")
+    calls = [(d['target'], d['target_kind'], d['line']) for d in dependencies if d['type'] == 'CALLS' and d['resolved']]
+    assert calls == [('CUSTPGM', 'Program', 11), ('TAX_CALC', 'Procedure', 12)]
+
+    def d_spec(name, kind, keywords, comment=''):
+        return ('     D' + name.ljust(15) + '  ' + kind.ljust(2)).ljust(43) + keywords.ljust(37) + comment
+
+    dependencies = _parse('ORDFIX.rpgle', '\n'.join([
+        d_spec('GetCust', 'PR', '', "EXTPGM('NOTME')"),   # columns 81+ are comments
+        d_spec('', '', "EXTPGM('CUSTPGM')"),
+        '     D' + 'id'.ljust(15) + '            10A',
+        "     C                   CALLP     GetCust(id)",
+    ]) + '\n')
+    prototype = [d for d in dependencies if d['type'] == 'PROTOTYPE'][0]
+    assert (prototype['target'], prototype['external'], prototype['line']) == ('GETCUST', 'CUSTPGM', 1)
+    calls = [(d['target'], d['target_kind'], d['line']) for d in dependencies if d['type'] == 'CALLS']
+    assert calls == [('CUSTPGM', 'Program', 4)]
+    print("✓ test_prototype_keywords_on_continuation_lines passed")
+
+
+def test_resolve_prototype_calls_codebase_wide():
+    """Test resolution through the codebase-wide prototype index"""
+    dependencies = _parse('CALLER.rpgle', "**free\ncallp GetCust(id);\n")
+    dependencies += _parse('PROTOS.rpgle', "**free\ndcl-pr GetCust extpgm('CUSTPGM') end-pr;\n")
+
+    index = rda.build_prototype_index(dependencies)
+    assert index == {'GETCUST': ('EXTPGM', 'CUSTPGM')}
+
+    resolved = rda.resolve_prototype_calls(dependencies, index)
+    assert not any(d['type'] == 'PROTOTYPE' for d in resolved)
+
+    call = [d for d in resolved if d['type'] == 'CALLS'][0]
+    assert (call['source'], call['target'], call['target_kind']) == ('CALLER', 'CUSTPGM', 'Program')
+    print("✓ test_resolve_prototype_calls_codebase_wide passed")
+
+
+def test_free_format_calls_resolved_codebase_wide():
+    """Test free-format calls without a visible prototype resolved through the index"""
+    dependencies = _parse('ORDENTRY.rpgle', """**free
+/copy QPROTOSRC,CUSTPR
+x = GetCust(1);
+callp GetCust(2);
+y = totals(3) + %len(name);
+""")
+    dependencies += _parse('CUSTSRV.rpgle', """**free
+ctl-opt nomain;
+dcl-pr GetCust extproc('GETCUST') end-pr;
+dcl-proc GetCust export;
+end-proc;
+""")
+
+    resolved = rda.resolve_prototype_calls(dependencies)
+
+    calls = [(d['source'], d['target'], d['target_kind'], d['line']) for d in resolved if d['type'] == 'CALLS']
+    assert calls == [('ORDENTRY', 'GETCUST', 'Procedure', 3), ('ORDENTRY', 'GETCUST', 'Procedure', 4)]
+    # Arrays and built-ins without a prototype never become procedures
+    assert not any('is_callp' in d for d in resolved)
+    print("✓ test_free_format_calls_resolved_codebase_wide passed")
+
+
+def run_all_tests():
+    """Run all prototype resolution tests"""
+    print("\n=== Running Prototype Resolution Tests ===\n")
+
+    test_parse_external_name()
+    test_detect_fixed_format_prototype_and_procedure()
+    test_detect_call_opcode()
+    test_parse_resolves_calls_through_prototypes()
+    test_prototype_keywords_on_continuation_lines()
+    test_resolve_prototype_calls_codebase_wide()
+    test_free_format_calls_resolved_codebase_wide()
+
+    print("\n✅ All prototype resolution tests passed!\n")
+
+
+if __name__ == '__main__':
+    run_all_tests()
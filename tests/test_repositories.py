@@ -0,0 +1,85 @@
+"""
+Tests for multi-repository scoping
+
+Tests the helpers that keep repositories apart in one database:
+- repository_scan()
+- combine_repository_islands()
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import nbimporter
+import rpg_dependency_analyzer as rda
+
+
+def test_repository_scan_uses_one_lookup_per_label():
+    """Test that the subquery matches each label by repository"""
+    query = rda.repository_scan(['Program', 'Table'])
+
+    assert query.startswith('CALL {')
+    assert query.rstrip().endswith('}')
+    assert 'MATCH (n:Program {repository: $repository}) RETURN n' in query
+    assert 'MATCH (n:Table {repository: $repository}) RETURN n' in query
+    assert query.count('UNION') == 1
+
+    assert 'MATCH (x:File {repository: $repository}) RETURN x' in rda.repository_scan(['File'], 'x')
+    print("✓ test_repository_scan_uses_one_lookup_per_label passed")
+
+
+def test_combine_islands_sharing_names():
+    """Test that islands of different repositories are merged through shared names"""
+    memberships = [
+        ('ORDERS', 0, 'Program', 'ORDENTRY'),
+        ('ORDERS', 0, 'Program', 'CUSTLKP'),     # stub: defined in CUSTOMER
+        ('ORDERS', 1, 'Program', 'ORDPURGE'),
+        ('CUSTOMER', 7, 'Program', 'CUSTLKP'),
+        ('CUSTOMER', 7, 'Table', 'CUSTMAST'),
+        ('CUSTOMER', 8, 'Table', 'CUSTHIST'),
+    ]
+
+    combined = rda.combine_repository_islands(memberships)
+
+    assert len(combined) == 3
+    assert combined[0]['islands'] == {('ORDERS', 0), ('CUSTOMER', 7)}
+    assert combined[0]['repositories'] == ['CUSTOMER', 'ORDERS']
+    assert combined[0]['shared'] == [('Program', 'CUSTLKP')]
+
+    singles = sorted(sorted(c['islands']) for c in combined[1:])
+    assert singles == [[('CUSTOMER', 8)], [('ORDERS', 1)]]
+    assert all(c['shared'] == [] for c in combined[1:])
+    print("✓ test_combine_islands_sharing_names passed")
+
+
+def test_combine_islands_transitively():
+    """Test that chains of shared names merge more than two repositories"""
+    memberships = [
+        ('A', 0, 'Program', 'X'),
+        ('B', 0, 'Program', 'X'),
+        ('B', 0, 'Table', 'T'),
+        ('C', 3, 'Table', 'T'),
+        ('C', 4, 'Procedure', 'X'),   # same name, different label: not shared
+    ]
+
+    combined = rda.combine_repository_islands(memberships)
+
+    assert combined[0]['repositories'] == ['A', 'B', 'C']
+    assert combined[0]['shared'] == [('Program', 'X'), ('Table', 'T')]
+    assert combined[1]['islands'] == {('C', 4)}
+    print("✓ test_combine_islands_transitively passed")
+
+
+def run_all_tests():
+    """Run all repository scoping tests"""
+    print("\n=== Running Repository Scoping Tests ===\n")
+
+    test_repository_scan_uses_one_lookup_per_label()
+    test_combine_islands_sharing_names()
+    test_combine_islands_transitively()
+
+    print("\n✅ All repository scoping tests passed!\n")
+
+
+if __name__ == '__main__':
+    run_all_tests()
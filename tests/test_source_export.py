@@ -0,0 +1,237 @@
+"""
+Tests for IBM i source export ingest
+
+Tests splitting source physical file exports into members:
+- ccsid_codec()
+- find_export_members() / decode_export_member() (LF, NL, CR+LF and CR+NL line ends,
+  positional SRCSEQ/SRCDAT columns)
+- ingest_source_export() feeding members into the parsers
+- SourceExportIndex resolving /COPY members inside exports
+- load_island_source_code() reading exported members
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import nbimporter
+import rpg_dependency_analyzer as rda
+
+
+def _export_file(content):
+    fd, path = tempfile.mkstemp(suffix='.txt', prefix='QRPGLESRC')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(content)
+    return path
+
+
+def test_ccsid_codec():
+    """Test CCSID to codec mapping"""
+    assert rda.ccsid_codec(37) == 'cp037'
+    assert rda.ccsid_codec(273) == 'cp273'
+    assert rda.ccsid_codec('cp500') == 'cp500'
+    try:
+        rda.ccsid_codec(99999)
+        assert False, "Unknown CCSID should raise"
+    except ValueError:
+        pass
+    print("✓ test_ccsid_codec passed")
+
+
+def test_ingest_line_delimited_ebcdic():
+    """Test an EBCDIC (CCSID 273) export with NL line ends and sequence columns"""
+    text = '\x85'.join([
+        "MEMBER: ORDENTRY RPGLE",
+        "000100240115     FORDERS    IF   E           K DISK",
+        "000200240115     C                   CALL      'ÄNDPGM'",
+        "MEMBER: CUSTUPD",
+        "000100000000**free",
+        "000200000000Dcl-F CUSTMAST Usage(*Update);",
+    ]) + '\x85'
+    path = _export_file(text.encode('cp273'))
+
+    try:
+        members = list(rda.ingest_source_export(path, ccsid=273))
+        names = [os.path.basename(member_path) for member_path, _ in members]
+        assert names == ['ORDENTRY.rpgle', 'CUSTUPD.rpgle']
+
+        source = members[0][1].getvalue()
+        assert source.splitlines()[0] == "     FORDERS    IF   E           K DISK"
+        assert "'ÄNDPGM'" in source
+        assert members[1][1].getvalue().startswith('**free\n')
+    finally:
+        os.remove(path)
+    print("✓ test_ingest_line_delimited_ebcdic passed")
+
+
+def test_ingest_fixed_length_records():
+    """Test an export of fixed-length records without line ends"""
+    record_length = 92
+    records = [
+        "MEMBER: NIGHTLY CLLE",
+        "000100240115PGM",
+        "000200240115             CALL       PGM(ORDPURGE)",
+        "000300240115ENDPGM",
+    ]
+    content = b''.join(r.ljust(record_length).encode('cp037') for r in records)
+    path = _export_file(content)
+
+    try:
+        members = list(rda.ingest_source_export(path, ccsid=37, record_length=record_length))
+        assert len(members) == 1
+
+        member_path, stream = members[0]
+        assert member_path.endswith('NIGHTLY.clle')
+        assert stream.getvalue().splitlines() == ['PGM', '             CALL       PGM(ORDPURGE)', 'ENDPGM']
+    finally:
+        os.remove(path)
+    print("✓ test_ingest_fixed_length_records passed")
+
+
+def test_ingested_members_parsed_as_programs():
+    """Test that ingested members are parsed with the member name as program name"""
+    text = '\n'.join([
+        "MEMBER: ORDENTRY",
+        "000100240115     C     ORDKEY        CHAIN     ORDERS",
+        "MEMBER: NIGHTLY CLLE",
+        "000100240115CALL PGM(ORDENTRY)",
+    ]) + '\n'
+    path = _export_file(text.encode('cp037'))
+
+    try:
+        dependencies = []
+        for member_path, stream in rda.ingest_source_export(path, ccsid=37):
+            dependencies.extend(rda.parse_source_file(member_path, stream=stream))
+
+        edges = [(d['source'], d['target'], d['type']) for d in dependencies]
+        assert edges == [('ORDENTRY', 'ORDERS', 'ACCESSES'), ('NIGHTLY', 'ORDENTRY', 'CALLS')]
+    finally:
+        os.remove(path)
+    print("✓ test_ingested_members_parsed_as_programs passed")
+
+
+def test_ingest_crlf_line_ends():
+    """Test CR+LF (ASCII) and CR+NL (EBCDIC) line ends as one terminator"""
+    for codec, line_end in (('latin-1', '\r\n'), ('cp037', '\r\x85')):
+        text = line_end.join([
+            "MEMBER: CUSTUPD",
+            "000100000000**free",
+            "000200000000Dcl-F CUSTMAST Usage(*Update);",
+            "MEMBER: NIGHTLY CLLE",
+            "000100240115PGM",
+            "000200240115CALL PGM(CUSTUPD)",
+        ]) + line_end
+        path = _export_file(text.encode(codec))
+
+        try:
+            dependencies = []
+            for member_path, stream in rda.ingest_source_export(path, ccsid=codec):
+                assert not stream.getvalue().startswith('\n')
+                dependencies.extend(rda.parse_source_file(member_path, stream=stream))
+
+            edges = [(d['source'], d['target'], d['type'], d['line']) for d in dependencies]
+            assert edges == [('CUSTUPD', 'CUSTMAST', 'ACCESSES', 2), ('NIGHTLY', 'CUSTUPD', 'CALLS', 2)], codec
+        finally:
+            os.remove(path)
+    print("✓ test_ingest_crlf_line_ends passed")
+
+
+def test_sequence_columns_stripped_by_position():
+    """Test that SRCSEQ/SRCDAT are cut from every record, also with a blank SRCDAT"""
+    text = '\n'.join([
+        "MEMBER: ORDPURGE",
+        "000100240115     C                   READ      ORDERS",
+        "000200      ",
+        "000300           C     ORDKEY        CHAIN     ORDHIST",
+        "                  *    Purge done",
+    ]) + '\n'
+    path = _export_file(text.encode('cp037'))
+
+    try:
+        [(member_path, stream)] = list(rda.ingest_source_export(path, ccsid=37))
+        assert stream.getvalue().splitlines() == [
+            "     C                   READ      ORDERS",
+            "",
+            "     C     ORDKEY        CHAIN     ORDHIST",
+            "      *    Purge done",
+        ]
+
+        stream.seek(0)
+        dependencies = rda.parse_source_file(member_path, stream=stream)
+        assert sorted((d['target'], d['line']) for d in dependencies) == [('ORDERS', 1), ('ORDHIST', 3)]
+    finally:
+        os.remove(path)
+    print("✓ test_sequence_columns_stripped_by_position passed")
+
+
+def test_copybooks_resolved_from_exports():
+    """Test /COPY of members inside a source export, e.g. a QPROTOSRC export"""
+    root = tempfile.mkdtemp()
+    try:
+        exports = []
+        for srcfile, members in (('QPROTOSRC', ["MEMBER: CUSTPR RPGLEINC", "000100000000**free",
+                                                "000200000000dcl-pr GetCust extpgm('CUSTPGM') end-pr;"]),
+                                 ('QRPGLESRC', ["MEMBER: ORDENTRY", "000100000000**free",
+                                                "000200000000/copy QPROTOSRC,CUSTPR",
+                                                "000300000000callp GetCust(1);"])):
+            path = os.path.join(root, f'{srcfile}.txt')
+            with open(path, 'wb') as f:
+                f.write(('\n'.join(members) + '\n').encode('cp037'))
+            exports.append({'path': path, 'ccsid': 37})
+
+        export_index = rda.SourceExportIndex(exports)
+        assert os.path.join(root, 'QPROTOSRC', 'CUSTPR.rpgleinc') in export_index
+        resolver = rda.CopybookResolver([], source_exports=export_index)
+
+        dependencies = []
+        for member_path, stream in rda.ingest_source_export(**exports[1]):
+            dependencies.extend(rda.parse_source_file(member_path, copybook_resolver=resolver, stream=stream))
+
+        calls = [(d['source'], d['target'], d['target_kind']) for d in dependencies if d['type'] == 'CALLS']
+        assert calls == [('ORDENTRY', 'CUSTPGM', 'Program')]
+        assert resolver.unresolved == []
+        assert resolver.include_edges[0]['target_path'].endswith(os.path.join('QPROTOSRC', 'CUSTPR.rpgleinc'))
+    finally:
+        shutil.rmtree(root)
+    print("✓ test_copybooks_resolved_from_exports passed")
+
+
+def test_island_source_loaded_from_exports():
+    """Test that Phase 7 reads exported members, which have no file on disk"""
+    text = '\n'.join(["MEMBER: ORDENTRY", "000100000000**free", "000200000000read ORDERS;"]) + '\n'
+    path = _export_file(text.encode('cp037'))
+
+    try:
+        [(member_path, stream)] = list(rda.ingest_source_export(path, ccsid=37))
+        source = stream.getvalue()
+        member_path = os.path.relpath(member_path, start=".")
+
+        export_index = rda.SourceExportIndex([{'path': path, 'ccsid': 37}])
+        assert rda.load_island_source_code([member_path], export_index=export_index) == {'ORDENTRY.rpgle': source}
+        assert rda.load_island_source_code([member_path], sources={member_path: 'kept'}) == {'ORDENTRY.rpgle': 'kept'}
+        assert rda.load_island_source_code([member_path]) == {}
+    finally:
+        os.remove(path)
+    print("✓ test_island_source_loaded_from_exports passed")
+
+
+def run_all_tests():
+    """Run all source export tests"""
+    print("\n=== Running Source Export Tests ===\n")
+
+    test_ccsid_codec()
+    test_ingest_line_delimited_ebcdic()
+    test_ingest_fixed_length_records()
+    test_ingested_members_parsed_as_programs()
+    test_ingest_crlf_line_ends()
+    test_sequence_columns_stripped_by_position()
+    test_copybooks_resolved_from_exports()
+    test_island_source_loaded_from_exports()
+
+    print("\n✅ All source export tests passed!\n")
+
+
+if __name__ == '__main__':
+    run_all_tests()
@@ -0,0 +1,207 @@
+"""
+Tests for watch mode
+
+Tests the incremental update path of Phase 9 without a database:
+- PollingWatcher / open_watcher() / collect_changes()
+- affected_members()
+- diff_dependencies()
+- assign_component_ids()
+- WatchDaemon.plan() / latency_summary()
+- apply_dependency_diff() (INCLUDES rebuild, with a recording transaction)
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import nbimporter
+import rpg_dependency_analyzer as rda
+
+
+class FakeTx:
+    """Transaction that records queries and returns no records"""
+
+    def __init__(self):
+        self.queries = []
+
+    def run(self, query, **params):
+        self.queries.append((query, params))
+        return []
+
+
+def _write(path, source):
+    with open(path, 'w') as f:
+        f.write(source)
+
+
+def _dep(source, target, kind='CALLS', line=1, action='EXECUTE'):
+    return {'source': source, 'source_path': f'src/{source}.rpgle', 'target': target, 'type': kind,
+            'target_kind': 'Program' if kind == 'CALLS' else 'Table', 'action': action,
+            'line': line, 'origin': f'src/{source}.rpgle'}
+
+
+def test_watchers_debounce_bursts():
+    """Test that a burst of saves, creates and deletes arrives as one batch"""
+    root = tempfile.mkdtemp()
+    try:
+        _write(os.path.join(root, 'OLD.rpgle'), '**free\n')
+        for open_watcher in (lambda: rda.PollingWatcher(root, interval=0.05),
+                             lambda: rda.open_watcher(root, poll_interval=0.05)):
+            watcher = open_watcher()
+            try:
+                assert rda.collect_changes(watcher, debounce_seconds=0.1, timeout=0.1) == {}
+
+                before = time.time()
+                _write(os.path.join(root, 'A.rpgle'), '**free\n')
+                os.makedirs(os.path.join(root, 'sub'), exist_ok=True)
+                _write(os.path.join(root, 'sub', 'B.rpgle'), '**free\n')
+                os.remove(os.path.join(root, 'OLD.rpgle'))
+
+                changes = rda.collect_changes(watcher, debounce_seconds=0.3, timeout=2.0)
+                assert set(changes) == {os.path.join(root, 'A.rpgle'), os.path.join(root, 'sub', 'B.rpgle'),
+                                        os.path.join(root, 'OLD.rpgle')}
+                assert all(seen >= before - 1 for seen in changes.values())
+            finally:
+                watcher.close()
+            _write(os.path.join(root, 'OLD.rpgle'), '**free\n')
+            shutil.rmtree(os.path.join(root, 'sub'))
+            os.remove(os.path.join(root, 'A.rpgle'))
+    finally:
+        shutil.rmtree(root)
+    print("✓ test_watchers_debounce_bursts passed")
+
+
+def test_affected_members_through_copybooks():
+    """Test that a changed copybook re-parses its direct and nested includers"""
+    include_edges = [
+        {'source_path': 'src/ORDENTRY.rpgle', 'target_path': 'src/CUSTPR.rpgleinc'},
+        {'source_path': 'src/CUSTPR.rpgleinc', 'target_path': 'src/./TYPES.rpgleinc'},
+        {'source_path': 'src/ORDPURGE.rpgle', 'target_path': 'src/TYPES.rpgleinc'},
+    ]
+
+    assert rda.affected_members({'src/TYPES.rpgleinc'}, include_edges) == {
+        'src/ORDENTRY.rpgle', 'src/ORDPURGE.rpgle'}
+    assert rda.affected_members({'src/CUSTPR.rpgleinc', 'src/NEW.sqlrpgle'}, include_edges) == {
+        'src/ORDENTRY.rpgle', 'src/NEW.sqlrpgle'}
+    assert rda.affected_members({'src/README.md'}, include_edges) == set()
+    print("✓ test_affected_members_through_copybooks passed")
+
+
+def test_diff_dependencies():
+    """Test added, removed and updated edges, collapsed like the loader does"""
+    old = [_dep('ORDENTRY', 'CUSTPGM', line=5), _dep('ORDENTRY', 'CUSTPGM', line=9),
+           _dep('ORDENTRY', 'CUSTMAST', 'ACCESSES', line=3, action='READ'),
+           _dep('ORDENTRY', 'TAXPGM', line=12)]
+    new = [_dep('ORDENTRY', 'CUSTPGM', line=5), _dep('ORDENTRY', 'CUSTPGM', line=9),
+           _dep('ORDENTRY', 'CUSTMAST', 'ACCESSES', line=3, action='UPDATE'),
+           _dep('ORDENTRY', 'TAXPGM', line=14)]
+
+    diff = rda.diff_dependencies(old, new)
+
+    assert [(r['target'], r['action']) for r in diff['added']] == [('CUSTMAST', 'UPDATE')]
+    assert [(r['target'], r['action']) for r in diff['removed']] == [('CUSTMAST', 'READ')]
+    assert [(r['target'], r['lines']) for r in diff['updated']] == [('TAXPGM', [14])]
+    assert rda.diff_dependencies(old, list(reversed(old[::-1]))) == {'added': [], 'removed': [], 'updated': []}
+    print("✓ test_diff_dependencies passed")
+
+
+def test_assign_component_ids_stays_stable():
+    """Test that split and merged islands keep the id of their majority"""
+    previous = {'a': 3, 'b': 3, 'c': 3, 'd': 3, 'e': 5, 'f': None}
+
+    # Island 3 splits: the larger part keeps 3, the rest gets a fresh id
+    assignment = rda.assign_component_ids([{'a', 'b', 'c'}, {'d'}, {'e', 'f'}], previous, taken=[0, 7])
+    assert {assignment[n] for n in 'abc'} == {3}
+    assert assignment['d'] == 8
+    assert assignment['e'] == assignment['f'] == 5
+
+    # Islands 3 and 5 merge into the id of the majority
+    assignment = rda.assign_component_ids([set(previous)], previous, taken=[])
+    assert set(assignment.values()) == {3}
+    print("✓ test_assign_component_ids_stays_stable passed")
+
+
+def test_watch_daemon_plans_incremental_update():
+    """Test that a copybook change re-parses its includer and diffs against the primed state"""
+    root = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    try:
+        os.chdir(root)
+        os.makedirs('src')
+        _write('src/ORDENTRY.rpgle', "**free\nexec sql select * from custmast;\n/copy CUSTPR\n")
+        _write('src/CUSTPR.rpgleinc', "**free\ndcl-pr GetCust extpgm('CUSTPGM') end-pr;\ncallp GetCust(id);\n")
+        _write('src/ORDPURGE.rpgle', "**free\nexec sql select * from ordhist;\n")
+
+        daemon = rda.WatchDaemon(None, 'src', 'SRC', copybook_library_path=['src'])
+        parsed, includes = daemon.parse_members(['src/ORDENTRY.rpgle', 'src/ORDPURGE.rpgle'])
+        daemon.prime([dep for deps in parsed.values() for dep in deps],
+                     [edge for edges in includes.values() for edge in edges])
+
+        assert daemon.plan(['src/README.md']) is None
+
+        _write('src/CUSTPR.rpgleinc', "**free\ndcl-pr GetCust extpgm('CUSTPGM2') end-pr;\ncallp GetCust(id);\n")
+        os.remove('src/ORDPURGE.rpgle')
+        plan = daemon.plan([os.path.join(root, 'src', 'CUSTPR.rpgleinc'), 'src/ORDPURGE.rpgle'])
+
+        assert set(plan['parsed']) == {'src/ORDENTRY.rpgle', 'src/ORDPURGE.rpgle'}
+        assert [(r['source'], r['target']) for r in plan['diff']['added']] == [('ORDENTRY', 'CUSTPGM2')]
+        assert sorted((r['source'], r['target']) for r in plan['diff']['removed']) == [
+            ('ORDENTRY', 'CUSTPGM'), ('ORDPURGE', 'ORDHIST')]
+        assert [(m['source'], m['deleted']) for m in plan['members']] == [
+            ('ORDENTRY', False), ('ORDPURGE', True)]
+        assert [e['target'] for e in plan['includes']['src/ORDENTRY.rpgle']] == ['CUSTPR']
+
+        daemon.metrics = [{'latency_seconds': s} for s in (0.4, 0.2, 1.5, 0.3)]
+        assert daemon.latency_summary() == {'batches': 4, 'p50': 0.4, 'p95': 1.5, 'max': 1.5}
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(root)
+    print("✓ test_watch_daemon_plans_incremental_update passed")
+
+
+def test_apply_dependency_diff_rebuilds_copybook_includes():
+    """Test that INCLUDES of re-parsed copybooks are replaced, not only those of files"""
+    include_edges = [
+        {'source_path': 'src/ORDENTRY.rpgle', 'source_is_copybook': False, 'target': 'CUSTPR',
+         'target_path': 'src/CUSTPR.rpgleinc', 'line': 3},
+        {'source_path': 'src/CUSTPR.rpgleinc', 'source_is_copybook': True, 'target': 'TYPES',
+         'target_path': 'src/TYPES.rpgleinc', 'line': 1},
+    ]
+    members = [{'source': 'ORDENTRY', 'source_path': 'src/ORDENTRY.rpgle', 'source_ext': 'RPGLE',
+                'source_code': None, 'deleted': False}]
+    diff = {'added': [], 'removed': [], 'updated': []}
+
+    tx = FakeTx()
+    seeds = rda.apply_dependency_diff(tx, 'SRC', diff, members, include_edges)
+
+    assert seeds == [('Program', 'ORDENTRY')]
+    deletes = [params for query, params in tx.queries if 'DELETE r' in query and 'INCLUDES' in query]
+    assert len(deletes) == 1
+    assert deletes[0]['files'] == ['src/ORDENTRY.rpgle']
+    assert deletes[0]['copybooks'] == ['src/CUSTPR.rpgleinc', 'src/TYPES.rpgleinc']
+
+    merges = [params for query, params in tx.queries if 'MERGE (s)-[r:INCLUDES]->(c)' in query]
+    assert sorted((row['source_path'], row['target_path']) for row in merges[0]['rows']) == [
+        ('src/CUSTPR.rpgleinc', 'src/TYPES.rpgleinc'), ('src/ORDENTRY.rpgle', 'src/CUSTPR.rpgleinc')]
+    print("✓ test_apply_dependency_diff_rebuilds_copybook_includes passed")
+
+
+def run_all_tests():
+    """Run all watch mode tests"""
+    print("\n=== Running Watch Mode Tests ===\n")
+
+    test_watchers_debounce_bursts()
+    test_affected_members_through_copybooks()
+    test_diff_dependencies()
+    test_assign_component_ids_stays_stable()
+    test_watch_daemon_plans_incremental_update()
+    test_apply_dependency_diff_rebuilds_copybook_includes()
+
+    print("\n✅ All watch mode tests passed!\n")
+
+
+if __name__ == '__main__':
+    run_all_tests()